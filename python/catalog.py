@@ -0,0 +1,190 @@
+"""
+Columnar product catalog
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Transit label order shared by the weighted choice and the capacity/cost lookup tables.
+TRANSIT_MODES = ("PALLET", "CONTAINER", "COURIER")
+
+_ARRAY_COLUMNS = (
+    "price",
+    "size",
+    "logistics",
+    "transit",
+    "transit_size",
+    "transit_cost",
+    "demand",
+    "markup",
+    "stock",
+)
+
+
+def _transit_codes(labels) -> Dict[str, int]:
+    """Code per transit label: `TRANSIT_MODES` first, then others in order seen."""
+
+    codes = {mode: code for code, mode in enumerate(TRANSIT_MODES)}
+    for label in labels:
+        codes.setdefault(label, len(codes))
+    return codes
+
+
+def _transit_dtype(codes: Dict[str, int]) -> type:
+    """int8 codes, as generated tables use, unless there are too many labels."""
+
+    return np.int8 if len(codes) <= np.iinfo(np.int8).max + 1 else np.int32
+
+
+@dataclass(slots=True)
+class ProductTable:
+    """Struct-of-arrays catalog: one aligned column per `ProductItem` field.
+
+    Generated rows are numbered from `id_start` and their `P000001`-style ids
+    are only formatted when `ids` is first read; tables built from existing
+    messages carry their ids in `id_labels`. `transit` holds small integer
+    codes into `transit_labels`, which starts with `TRANSIT_MODES` and gains
+    any other label seen in the messages.
+    """
+
+    price: np.ndarray
+    size: np.ndarray
+    logistics: np.ndarray
+    transit: np.ndarray
+    transit_size: np.ndarray
+    transit_cost: np.ndarray
+    demand: np.ndarray
+    markup: np.ndarray
+    stock: np.ndarray
+    id_start: int = 1
+    id_labels: Optional[List[str]] = field(default=None, repr=False)
+    transit_labels: Tuple[str, ...] = TRANSIT_MODES
+
+    @property
+    def ids(self) -> List[str]:
+        if self.id_labels is None:
+            # printf-style formatting is ~25% faster than an f-string here.
+            self.id_labels = [
+                "P%06d" % index
+                for index in range(self.id_start, self.id_start + len(self))
+            ]
+        return self.id_labels
+
+    def id_at(self, row: int) -> str:
+        """Id of a single row, without formatting the ids of the whole table."""
+        if self.id_labels is not None:
+            return self.id_labels[row]
+        return "P%06d" % (self.id_start + row)
+
+    @classmethod
+    def concat(cls, tables: List["ProductTable"]) -> "ProductTable":
+        """Stack row chunks (e.g. from `ProductGenerator.generate_batches`)."""
+
+        columns = {
+            name: np.concatenate([getattr(table, name) for table in tables])
+            for name in _ARRAY_COLUMNS
+        }
+        transit_labels = tables[0].transit_labels
+        if any(table.transit_labels != transit_labels for table in tables):
+            transit_codes = _transit_codes(
+                label for table in tables for label in table.transit_labels
+            )
+            transit_labels = tuple(transit_codes)
+            columns["transit"] = np.concatenate(
+                [
+                    np.array(
+                        [transit_codes[label] for label in table.transit_labels],
+                        dtype=_transit_dtype(transit_codes),
+                    )[table.transit]
+                    for table in tables
+                ]
+            )
+        numbered = all(table.id_labels is None for table in tables) and all(
+            after.id_start == before.id_start + len(before)
+            for before, after in zip(tables, tables[1:])
+        )
+        if numbered:
+            return cls(
+                id_start=tables[0].id_start, transit_labels=transit_labels, **columns
+            )
+        return cls(
+            id_labels=[product_id for table in tables for product_id in table.ids],
+            transit_labels=transit_labels,
+            **columns,
+        )
+
+    @classmethod
+    def from_messages(cls, messages) -> "ProductTable":
+        """Build a table from protobuf `ProductItem` messages (e.g. an RPC payload)."""
+
+        # Labels outside TRANSIT_MODES (including the proto3 default "") get
+        # codes of their own so each keeps its own transit cost in the solver.
+        transit_codes = _transit_codes(message.transit for message in messages)
+        transit = [transit_codes[message.transit] for message in messages]
+        return cls(
+            id_labels=[message.id for message in messages],
+            transit_labels=tuple(transit_codes),
+            price=np.array([message.price for message in messages], dtype=np.int64),
+            size=np.array([message.size for message in messages], dtype=np.int64),
+            logistics=np.array([message.logistics for message in messages]),
+            transit=np.array(transit, dtype=_transit_dtype(transit_codes)),
+            transit_size=np.array([message.transit_size for message in messages]),
+            transit_cost=np.array([message.transit_cost for message in messages]),
+            demand=np.array([message.demand for message in messages]),
+            markup=np.array([message.markup for message in messages]),
+            stock=np.array([message.stock for message in messages], dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def transit_names(self) -> np.ndarray:
+        """Map the transit codes back to their `transit_labels` names."""
+
+        return np.array(self.transit_labels)[self.transit]
+
+    def write_messages(self, repeated_products) -> None:
+        """Append one `ProductItem` per row to a repeated protobuf field.
+
+        `repeated.add(...)` fills messages in place inside the parent, which is
+        markedly cheaper than constructing standalone messages and then
+        copying them in with `extend`.
+        """
+
+        add = repeated_products.add
+        for (
+            product_id,
+            price,
+            size,
+            logistics,
+            transit,
+            transit_size,
+            transit_cost,
+            demand,
+            markup,
+            stock,
+        ) in zip(
+            self.ids,
+            self.price.tolist(),
+            self.size.tolist(),
+            self.logistics.tolist(),
+            self.transit_names().tolist(),
+            self.transit_size.tolist(),
+            self.transit_cost.tolist(),
+            self.demand.tolist(),
+            self.markup.tolist(),
+            self.stock.tolist(),
+        ):
+            add(
+                id=product_id,
+                price=price,
+                size=size,
+                logistics=logistics,
+                transit=transit,
+                transit_size=transit_size,
+                transit_cost=transit_cost,
+                demand=demand,
+                markup=markup,
+                stock=stock,
+            )
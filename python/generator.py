@@ -1,85 +1,72 @@
 """
 Cartesian Product Enumeration
 """
-import itertools
 import math
-import random
 import numpy as np
-from typing import List, Protocol
-from dataclasses import dataclass
+from typing import Iterator, Optional, Protocol, Sequence
+from dataclasses import dataclass, field
 
-import algsolver_pb2
+from catalog import TRANSIT_MODES, ProductTable
 from common import format_number, format_price, format_volume, log
 
 
-ProductItemMessage = getattr(algsolver_pb2, "ProductItem")
-
-
 class ZoneMode(Protocol):
     """Protocol for zone value generation strategies."""
 
     def generate(
         self, start: float, end: float, zone: "Zone", guardrails
-    ) -> List[float]: ...
+    ) -> np.ndarray: ...
 
 
-@dataclass
 class ExactMode:
     """Generate values at exact step intervals."""
 
     def generate(
         self, start: float, end: float, zone: "Zone", guardrails
-    ) -> List[float]:
+    ) -> np.ndarray:
         span = max(guardrails.min_span, end - start)
         step = max(guardrails.min_step, zone.step)
         count = max(int(span / step) + 1, guardrails.min_count)
-        values = np.linspace(start, end, count)
-        return [float(v) for v in values]
+        return np.linspace(start, end, count)
 
 
-@dataclass
 class PowerCurveMode:
     """Generate values along a power curve (bias controls concentration)."""
 
     def generate(
         self, start: float, end: float, zone: "Zone", guardrails
-    ) -> List[float]:
+    ) -> np.ndarray:
         resolution = max(guardrails.min_resolution, zone.resolution)
         t = np.linspace(0.0, 1.0, resolution)
         shaped = t ** max(guardrails.min_bias, zone.bias)
-        values = start + (end - start) * shaped
-        return [float(v) for v in values]
+        return start + (end - start) * shaped
 
 
-@dataclass
 class GeometricMode:
     """Generate values in geometric progression."""
 
     def generate(
         self, start: float, end: float, zone: "Zone", guardrails
-    ) -> List[float]:
+    ) -> np.ndarray:
         resolution = max(guardrails.min_resolution, zone.resolution)
         if resolution <= 1:
-            return [float(start)]
+            return np.array([float(start)])
 
         safe_start = max(guardrails.min_safe_start, start)
         safe_end = max(safe_start, end)
-        ratio = (safe_end / safe_start) ** (1.0 / (resolution - 1))
-        return [safe_start * (ratio**i) for i in range(resolution)]
+        return np.geomspace(safe_start, safe_end, resolution)
 
 
-@dataclass
 class UShapeMode:
     """Generate values with edge density (U-shaped distribution)."""
 
     def generate(
         self, start: float, end: float, zone: "Zone", guardrails
-    ) -> List[float]:
+    ) -> np.ndarray:
         resolution = max(guardrails.min_resolution, zone.resolution)
         t = np.linspace(0.0, 1.0, resolution)
         edge_dense = 0.5 - 0.5 * np.cos(np.pi * t)
-        values = start + (end - start) * edge_dense
-        return [float(v) for v in values]
+        return start + (end - start) * edge_dense
 
 
 MODE_REGISTRY: dict[str, ZoneMode] = {
@@ -90,7 +77,7 @@ MODE_REGISTRY: dict[str, ZoneMode] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Zone:
     """Zone configuration used for value generation."""
 
@@ -101,7 +88,7 @@ class Zone:
     step: float
 
 
-@dataclass
+@dataclass(slots=True)
 class DemandModel:
     """Demand probability model."""
 
@@ -113,21 +100,31 @@ class DemandModel:
     noise: float
     min_demand: float
     max_demand: float
-
-    def evaluate(self, price: float, size: float) -> float:
-        price_norm = math.log10(max(1.0, price)) / math.log10(
+    _price_log_weight: float = field(init=False, repr=False, compare=False)
+    _size_log_weight: float = field(init=False, repr=False, compare=False)
+    _noise_bounds: tuple[float, float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._noise_bounds = (1.0 - self.noise, 1.0 + self.noise)
+        # sensitivity * log10(x) / log10(scale) == ln(x) * (sensitivity / ln(scale))
+        self._price_log_weight = self.price_sensitivity / math.log(
             max(10.0, self.price_scale)
         )
-        size_norm = math.log10(max(1.0, size)) / math.log10(max(10.0, self.size_scale))
-        demand_penalty = (self.price_sensitivity * price_norm) + (
-            self.size_sensitivity * size_norm
+        self._size_log_weight = self.size_sensitivity / math.log(
+            max(10.0, self.size_scale)
         )
-        demand = self.base_demand * math.exp(-demand_penalty)
-        demand *= random.uniform(1.0 - self.noise, 1.0 + self.noise)
-        return max(self.min_demand, min(self.max_demand, demand))
+
+    def evaluate(
+        self, prices: np.ndarray, sizes: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        price_penalty = self._price_log_weight * np.log(np.maximum(1.0, prices))
+        size_penalty = self._size_log_weight * np.log(np.maximum(1.0, sizes))
+        demand = (self.base_demand * np.exp(-price_penalty)) * np.exp(-size_penalty)
+        demand = demand * rng.uniform(*self._noise_bounds, demand.shape)
+        return np.maximum(self.min_demand, np.minimum(self.max_demand, demand))
 
 
-@dataclass
+@dataclass(slots=True)
 class MarkupModel:
     """Markup model."""
 
@@ -138,16 +135,47 @@ class MarkupModel:
     price_divisor: float
     min_rate: float
     max_rate_clamp: float
+    _log_price_weight: float = field(init=False, repr=False, compare=False)
+    _noise_bounds: tuple[float, float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._log_price_weight = self.price_scale / self.price_divisor
+        self._noise_bounds = (1.0 - self.noise, 1.0 + self.noise)
+
+    def evaluate(
+        self, prices: np.ndarray, rng: np.random.Generator, shape: tuple[int, ...]
+    ) -> np.ndarray:
+        rate = self.base_rate + self._log_price_weight * np.log10(
+            np.maximum(1.0, prices)
+        )
+        rate = np.minimum(self.max_rate, np.maximum(self.min_rate, rate))
+        rate = rate * rng.uniform(*self._noise_bounds, shape)
+        return np.maximum(self.min_rate, np.minimum(self.max_rate_clamp, rate))
+
+
+def _regime_lookup() -> np.ndarray:
+    """Regime row (large/medium/small-dense/default) for every 4-bit flag code.
+
+    Bits: 1 = size >= large, 2 = size >= medium, 4 = size <= small,
+    8 = density >= high-density.
+    """
+    lookup = np.empty(16, dtype=np.intp)
+    for code in range(16):
+        if code & 1:
+            lookup[code] = 0
+        elif code & 2:
+            lookup[code] = 1
+        elif code & 4 and code & 8:
+            lookup[code] = 2
+        else:
+            lookup[code] = 3
+    return lookup
+
 
-    def evaluate(self, price: float) -> float:
-        price_factor = math.log10(max(1.0, price)) / self.price_divisor
-        rate = self.base_rate + (price_factor * self.price_scale)
-        rate = min(self.max_rate, max(self.min_rate, rate))
-        rate *= random.uniform(1.0 - self.noise, 1.0 + self.noise)
-        return max(self.min_rate, min(self.max_rate_clamp, rate))
+_REGIME_BY_FLAGS = _regime_lookup()
 
 
-@dataclass
+@dataclass(slots=True)
 class TransitModel:
     """Transit mode assignment model."""
 
@@ -176,67 +204,91 @@ class TransitModel:
     container_capacity: float
     container_cost: float
     density_epsilon: float
+    _weights: np.ndarray = field(init=False, repr=False, compare=False)
+    _capacities: np.ndarray = field(init=False, repr=False, compare=False)
+    _costs: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # The lookup tables depend only on the config, so they are built once
+        # rather than on every `assign_transit` chunk.
+        self._weights = self._weight_table()
+        self._capacities, self._costs = self._mode_profiles()
+        for table in (self._weights, self._capacities, self._costs):
+            table.flags.writeable = False
 
     @staticmethod
     def _weighted_choice(
-        pallet_weight: float, container_weight: float, courier_weight: float
-    ) -> str:
-        normalized = {
-            "PALLET": max(0.0, pallet_weight),
-            "CONTAINER": max(0.0, container_weight),
-            "COURIER": max(0.0, courier_weight),
-        }
-        total = sum(normalized.values())
-        if total <= 0.0:
-            return "PALLET"
-
-        draw = random.random() * total
-        running = 0.0
-        for mode in ("PALLET", "CONTAINER", "COURIER"):
-            running += normalized.get(mode, 0.0)
-            if draw <= running:
-                return mode
-        return "COURIER"
-
-    def _mode_profile(self, transit: str) -> tuple[float, float]:
-        profiles = {
-            "COURIER": (self.courier_capacity, self.courier_cost),
-            "CONTAINER": (self.container_capacity, self.container_cost),
-            "PALLET": (self.pallet_capacity, self.pallet_cost),
-        }
-        return profiles.get(transit, profiles["PALLET"])
-
-    def assign_transit(self, price: float, size: float):
-        density = price / max(self.density_epsilon, size)
-
-        pallet_weight = self.pallet_base_weight
-        container_weight = self.container_base_weight
-        courier_weight = self.courier_base_weight
-
-        if size >= self.large_size_threshold:
-            container_weight *= self.large_container_multiplier
-            pallet_weight *= self.large_pallet_multiplier
-            courier_weight *= self.large_courier_multiplier
-        elif size >= self.medium_size_threshold:
-            container_weight *= self.medium_container_multiplier
-            pallet_weight *= self.medium_pallet_multiplier
-            courier_weight *= self.medium_courier_multiplier
-        elif (
-            size <= self.small_size_threshold and density >= self.high_density_threshold
-        ):
-            courier_weight *= self.small_courier_multiplier
-            pallet_weight *= self.small_pallet_multiplier
-            container_weight *= self.small_container_multiplier
-        else:
-            pallet_weight *= self.default_pallet_multiplier
-            container_weight *= self.default_container_multiplier
+        weights: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        """Draw one `TRANSIT_MODES` index per row from (..., 3) weights."""
+        cumulative = np.maximum(0.0, weights).cumsum(axis=-1)
+
+        # A zero total draws 0.0, which lands on PALLET like the scalar fallback did.
+        draw = rng.random(cumulative.shape[:-1]) * cumulative[..., -1]
+        return (draw[..., None] > cumulative[..., :-1]).sum(axis=-1, dtype=np.int8)
+
+    def _mode_profiles(self) -> tuple[np.ndarray, np.ndarray]:
+        capacities = np.array(
+            [self.pallet_capacity, self.container_capacity, self.courier_capacity]
+        )
+        costs = np.array([self.pallet_cost, self.container_cost, self.courier_cost])
+        return capacities, costs
+
+    def _weight_table(self) -> np.ndarray:
+        """Base weights scaled per regime: rows large/medium/small-dense/default."""
+        multipliers = np.array(
+            [
+                [
+                    self.large_pallet_multiplier,
+                    self.large_container_multiplier,
+                    self.large_courier_multiplier,
+                ],
+                [
+                    self.medium_pallet_multiplier,
+                    self.medium_container_multiplier,
+                    self.medium_courier_multiplier,
+                ],
+                [
+                    self.small_pallet_multiplier,
+                    self.small_container_multiplier,
+                    self.small_courier_multiplier,
+                ],
+                [
+                    self.default_pallet_multiplier,
+                    self.default_container_multiplier,
+                    1.0,
+                ],
+            ]
+        )
+        base_weights = np.array(
+            [
+                self.pallet_base_weight,
+                self.container_base_weight,
+                self.courier_base_weight,
+            ]
+        )
+        return base_weights * multipliers
+
+    def assign_transit(
+        self, prices: np.ndarray, sizes: np.ndarray, rng: np.random.Generator
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        density = prices / np.maximum(self.density_epsilon, sizes)
+
+        # Pack the four threshold tests into one bit code per row and map it
+        # to a `_weight_table` row in a single gather.
+        size_flags = (
+            (sizes >= self.large_size_threshold).view(np.uint8)
+            | ((sizes >= self.medium_size_threshold).view(np.uint8) << 1)
+            | ((sizes <= self.small_size_threshold).view(np.uint8) << 2)
+        )
+        dense_flag = (density >= self.high_density_threshold).view(np.uint8) << 3
+        regime = _REGIME_BY_FLAGS[size_flags | dense_flag]
 
-        transit = self._weighted_choice(pallet_weight, container_weight, courier_weight)
-        transit_capacity, transit_cost = self._mode_profile(transit)
-        return transit, transit_capacity, transit_cost
+        transit = self._weighted_choice(self._weights[regime], rng)
+        return transit, self._capacities[transit], self._costs[transit]
 
 
-@dataclass
+@dataclass(slots=True)
 class LogisticsModel:
     """Logistics difficulty model."""
 
@@ -245,17 +297,20 @@ class LogisticsModel:
     max_difficulty: float
     optimal: float
     base_cost: float
+    _log_optimal: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._log_optimal = math.log10(max(self.min_size_log, self.optimal))
 
-    def calculate_logistics(self, size: float) -> float:
-        log_size = math.log10(max(self.min_size_log, size))
-        log_opt = math.log10(max(self.min_size_log, self.optimal))
-        diff = log_size - log_opt
+    def calculate_logistics(self, sizes: np.ndarray) -> np.ndarray:
+        log_size = np.log10(np.maximum(self.min_size_log, sizes))
+        diff = log_size - self._log_optimal
         penalty = self.penalty_factor * (diff**2)
         val = self.base_cost + penalty
-        return min(self.max_difficulty, val)
+        return np.minimum(self.max_difficulty, val)
 
 
-@dataclass
+@dataclass(slots=True)
 class TransitModel_V2:
     """Transit selection by minimum total shipment cost for product volume."""
 
@@ -267,20 +322,24 @@ class TransitModel_V2:
     container_cost: float
     min_capacity_epsilon: float
 
-    def _total_cost(self, size: float, mode_capacity: float, mode_cost: float) -> float:
+    def _total_cost(
+        self, sizes: np.ndarray, mode_capacity: float, mode_cost: float
+    ) -> np.ndarray:
         safe_capacity = max(self.min_capacity_epsilon, mode_capacity)
-        trips = math.ceil(size / safe_capacity)
+        trips = np.ceil(sizes / safe_capacity)
         return trips * mode_cost
 
-    def min_total_cost(self, size: float) -> float:
-        return min(
-            self._total_cost(size, self.courier_capacity, self.courier_cost),
-            self._total_cost(size, self.pallet_capacity, self.pallet_cost),
-            self._total_cost(size, self.container_capacity, self.container_cost),
+    def min_total_cost(self, sizes: np.ndarray) -> np.ndarray:
+        return np.minimum.reduce(
+            [
+                self._total_cost(sizes, self.courier_capacity, self.courier_cost),
+                self._total_cost(sizes, self.pallet_capacity, self.pallet_cost),
+                self._total_cost(sizes, self.container_capacity, self.container_cost),
+            ]
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class StockModel:
     """Stock supply model."""
 
@@ -298,35 +357,67 @@ class StockModel:
     min_price_norm: float
     min_size_norm: float
     min_scale: float
-
-    def generate_stock(self, price: float, size: float) -> int:
-        chance_infinite = self.infinite_chance_base
-        chance_infinite *= math.exp(-price / self.infinite_decay_scale)
-        chance_infinite *= math.exp(
-            -size / (self.infinite_decay_scale * self.infinite_decay_size_multiplier)
+    _price_log_weight: float = field(init=False, repr=False, compare=False)
+    _size_log_weight: float = field(init=False, repr=False, compare=False)
+    _price_decay_rate: float = field(init=False, repr=False, compare=False)
+    _size_decay_rate: float = field(init=False, repr=False, compare=False)
+    _noise_bounds: tuple[float, float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._noise_bounds = (1.0 - self.noise, 1.0 + self.noise)
+        self._price_decay_rate = 1.0 / self.infinite_decay_scale
+        self._size_decay_rate = 1.0 / (
+            self.infinite_decay_scale * self.infinite_decay_size_multiplier
         )
-        chance_infinite = max(0.0, min(1.0, chance_infinite))
-
-        if random.random() < chance_infinite:
-            return self.infinite_stock_value
-
-        price_norm = math.log10(max(self.min_price_norm, price)) / math.log10(
+        self._price_log_weight = self.price_sensitivity / math.log(
             max(self.min_scale, self.price_scale)
         )
-        size_norm = math.log10(max(self.min_size_norm, size)) / math.log10(
+        self._size_log_weight = self.size_sensitivity / math.log(
             max(self.min_scale, self.size_scale)
         )
-        stock_penalty = (self.price_sensitivity * price_norm) + (
-            self.size_sensitivity * size_norm
+
+    def generate_stock(
+        self, prices: np.ndarray, sizes: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        # exp(-(a*p + b*s)) factors per axis, so exp runs on the (P,1) and
+        # (1,S) vectors and only the product is expanded to the full grid.
+        chance_infinite = (
+            self.infinite_chance_base * np.exp(-self._price_decay_rate * prices)
+        ) * np.exp(-self._size_decay_rate * sizes)
+        chance_infinite = np.maximum(0.0, np.minimum(1.0, chance_infinite))
+        infinite = rng.random(chance_infinite.shape) < chance_infinite
+
+        price_penalty = self._price_log_weight * np.log(
+            np.maximum(self.min_price_norm, prices)
         )
-        stock = self.base_stock * math.exp(-stock_penalty)
-        stock *= random.uniform(1.0 - self.noise, 1.0 + self.noise)
-        return max(self.min_stock, int(stock))
+        size_penalty = self._size_log_weight * np.log(
+            np.maximum(self.min_size_norm, sizes)
+        )
+        stock = (self.base_stock * np.exp(-price_penalty)) * np.exp(-size_penalty)
+        stock = stock * rng.uniform(*self._noise_bounds, stock.shape)
+        stock = np.maximum(self.min_stock, stock.astype(np.int64))
+        return np.where(infinite, self.infinite_stock_value, stock)
+
+
+# Target products per streamed chunk; rounded down to whole price rows.
+BATCH_SIZE = 1 << 16
+
+
+def _flatten_grid(values: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+    """Expand an axis-only (or full) array over the price x size grid, row-major.
+
+    The result is always a plain writable array: full grids are reshaped and
+    axis-only arrays are copied out of the broadcast view.
+    """
+
+    if values.shape == shape:
+        return values.reshape(-1)
+    return np.ascontiguousarray(np.broadcast_to(values, shape)).reshape(-1)
 
 
 def generate_zone_values(
-    min_val: float, max_val: float, zones: List[Zone], guardrails
-) -> List[int]:
+    min_val: float, max_val: float, zones: Sequence[Zone], guardrails
+) -> np.ndarray:
     """Generate integer bucket values from zones."""
 
     total_span = max_val - min_val
@@ -335,7 +426,7 @@ def generate_zone_values(
         raise ValueError("Zone span_share total must be > 0")
 
     norm_shares = [zone.span_share / total_share for zone in zones]
-    values: list[int] = []
+    segments: list[np.ndarray] = []
     boundary = min_val
 
     for index, (zone, share) in enumerate(zip(zones, norm_shares)):
@@ -344,27 +435,35 @@ def generate_zone_values(
         zone_end = zone_start + zone_span
 
         zone_values = zone.mode.generate(zone_start, zone_end, zone, guardrails)
-        rounded = [max(guardrails.round_min, int(round(v))) for v in zone_values]
+        rounded = np.rint(zone_values).astype(np.int64)
 
         if index > 0:
             rounded = rounded[1:]
 
-        values.extend(rounded)
+        segments.append(rounded)
         boundary = zone_end
 
-    return values
+    return np.maximum(guardrails.round_min, np.concatenate(segments))
 
 
 class ProductGenerator:
     """Generate product catalog from protobuf `AppConfig`."""
 
-    def __init__(self, app_config, use_transit_v2: bool = False):
+    def __init__(
+        self, app_config, use_transit_v2: bool = False, seed: Optional[int] = None
+    ):
         self.generation = app_config.generation
         self.guardrails = app_config.guardrails
         self.use_transit_v2 = use_transit_v2
+        # One generator feeds every noise/choice draw; a fixed seed makes runs
+        # repeatable at a fixed chunk size (see `generate_batches`).
+        self.rng = np.random.default_rng(seed)
 
         self.price_zones = self._build_zones(self.generation.price_zones)
         self.size_zones = self._build_zones(self.generation.size_zones)
+        # Bucket ladders are deterministic in the config, so they are built once
+        # and reused by every generate()/generate_batches() call.
+        self._buckets: Optional[tuple[np.ndarray, np.ndarray]] = None
 
         demand = app_config.demand
         self.demand_model = DemandModel(
@@ -456,130 +555,162 @@ class ProductGenerator:
 
     @classmethod
     def from_proto_config(
-        cls, proto_app_config, use_transit_v2: bool = False
+        cls,
+        proto_app_config,
+        use_transit_v2: bool = False,
+        seed: Optional[int] = None,
     ) -> "ProductGenerator":
         """Factory from protobuf `AppConfig` message."""
 
-        return cls(proto_app_config, use_transit_v2=use_transit_v2)
+        return cls(proto_app_config, use_transit_v2=use_transit_v2, seed=seed)
 
     @staticmethod
     def _log(message: str):
         log("generator", message)
 
-    def _build_zones(self, zone_configs) -> List[Zone]:
-        zones: list[Zone] = []
-        for zone_config in zone_configs:
-            mode_obj = MODE_REGISTRY.get(zone_config.mode, MODE_REGISTRY["power"])
-            zones.append(
-                Zone(
-                    mode=mode_obj,
-                    span_share=float(zone_config.span_share),
-                    resolution=int(zone_config.resolution),
-                    bias=float(zone_config.bias),
-                    step=float(zone_config.step),
-                )
+    def _build_zones(self, zone_configs) -> tuple[Zone, ...]:
+        # Zones are fixed once built; a tuple keeps them read-only.
+        return tuple(
+            Zone(
+                mode=MODE_REGISTRY.get(zone_config.mode, MODE_REGISTRY["power"]),
+                span_share=float(zone_config.span_share),
+                resolution=int(zone_config.resolution),
+                bias=float(zone_config.bias),
+                step=float(zone_config.step),
             )
-        return zones
+            for zone_config in zone_configs
+        )
 
-    def generate(self) -> List[object]:
-        """Generate full Cartesian product of price-size combinations."""
+    def _build_buckets(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._buckets is None:
+            prices = generate_zone_values(
+                self.generation.min_price,
+                self.generation.max_price,
+                self.price_zones,
+                self.guardrails,
+            )
+            sizes = generate_zone_values(
+                self.generation.min_size,
+                self.generation.max_size,
+                self.size_zones,
+                self.guardrails,
+            )
+            prices.flags.writeable = False
+            sizes.flags.writeable = False
+            self._buckets = (prices, sizes)
 
-        self._log("Starting product generation")
+        prices, sizes = self._buckets
 
-        prices = generate_zone_values(
-            self.generation.min_price,
-            self.generation.max_price,
-            self.price_zones,
-            self.guardrails,
+        self._log(
+            f"Built price buckets: total={format_number(len(prices))}, unique={format_number(np.unique(prices).size)}, "
+            f"min={format_price(prices.min())}, max={format_price(prices.max())}"
         )
-        sizes = generate_zone_values(
-            self.generation.min_size,
-            self.generation.max_size,
-            self.size_zones,
-            self.guardrails,
+        self._log(
+            f"Built size buckets: total={format_number(len(sizes))}, unique={format_number(np.unique(sizes).size)}, "
+            f"min={format_volume(sizes.min())}, max={format_volume(sizes.max())}"
         )
+        return prices, sizes
 
-        self._log(
-            f"Built price buckets: total={format_number(len(prices))}, unique={format_number(len(set(prices)))}, "
-            f"min={format_price(min(prices))}, max={format_price(max(prices))}"
+    def _generate_block(
+        self, price_axis: np.ndarray, size_axis: np.ndarray, id_offset: int
+    ) -> ProductTable:
+        grid_shape = (price_axis.shape[0], size_axis.shape[1])
+
+        transit, transit_capacity, transit_cost = self.transit_model.assign_transit(
+            price_axis, size_axis, self.rng
         )
-        self._log(
-            f"Built size buckets: total={format_number(len(sizes))}, unique={format_number(len(set(sizes)))}, "
-            f"min={format_volume(min(sizes))}, max={format_volume(max(sizes))}"
+        if self.use_transit_v2:
+            transit_cost = self.transit_model_v2.min_total_cost(size_axis)
+
+        # Outputs are rounded in place on the arrays the models just built;
+        # logistics depends on size only, so only its (1, S) axis is rounded.
+        demand = self.demand_model.evaluate(price_axis, size_axis, self.rng)
+        np.round(demand, 3, out=demand)
+        logistics_cost = self.logistics_model.calculate_logistics(size_axis)
+        np.round(logistics_cost, 3, out=logistics_cost)
+        markup = self.markup_model.evaluate(price_axis, self.rng, grid_shape)
+        np.round(markup, 3, out=markup)
+        stock = self.stock_model.generate_stock(price_axis, size_axis, self.rng)
+
+        return ProductTable(
+            id_start=id_offset + 1,
+            price=_flatten_grid(price_axis, grid_shape).astype(np.int64),
+            size=_flatten_grid(size_axis, grid_shape).astype(np.int64),
+            logistics=_flatten_grid(logistics_cost, grid_shape),
+            transit=_flatten_grid(transit, grid_shape),
+            transit_size=_flatten_grid(transit_capacity, grid_shape),
+            transit_cost=_flatten_grid(transit_cost, grid_shape),
+            demand=_flatten_grid(demand, grid_shape),
+            markup=_flatten_grid(markup, grid_shape),
+            stock=_flatten_grid(stock, grid_shape),
         )
 
+    def generate_batches(self, batch_size: int = BATCH_SIZE) -> Iterator[ProductTable]:
+        """Stream the price-size Cartesian product as `ProductTable` chunks.
+
+        Each chunk covers whole price rows and holds roughly `batch_size`
+        products, so peak memory tracks the chunk rather than the catalog.
+
+        Chunks draw from the shared `self.rng` in turn, so a seeded catalog is
+        only reproduced with the same `batch_size`; `generate()` always uses
+        `BATCH_SIZE`.
+        """
+
+        self._log("Starting product generation")
+
+        prices, sizes = self._build_buckets()
+
         total_combinations = len(prices) * len(sizes)
         self._log(
             f"Cartesian combinations to evaluate: {format_number(total_combinations)}"
         )
 
-        products: list[object] = []
-        transit_counts = {"COURIER": 0, "PALLET": 0, "CONTAINER": 0}
+        # Price terms live on a (P, 1) column and size terms on a (1, S) row, so
+        # price-only and size-only math runs once per axis value and broadcasting
+        # builds the full grid only where both axes meet.
+        price_axis = np.asarray(prices, dtype=np.float64)[:, None]
+        size_axis = np.asarray(sizes, dtype=np.float64)[None, :]
+        rows_per_batch = max(1, batch_size // len(sizes))
+
+        transit_counts = np.zeros(len(TRANSIT_MODES), dtype=np.int64)
         infinite_stock_count = 0
+        processed = 0
+        # Report roughly every 10% no matter how many chunks the grid splits into.
         progress_step = max(1, total_combinations // 10)
+        next_progress = progress_step
 
-        for index, (price, size) in enumerate(
-            itertools.product(prices, sizes), start=1
-        ):
-            transit_rule, transit_capacity_rule, transit_cost_rule = (
-                self.transit_model.assign_transit(price, size)
+        for row_start in range(0, len(prices), rows_per_batch):
+            block = self._generate_block(
+                price_axis[row_start : row_start + rows_per_batch], size_axis, processed
             )
-            transit_cost_v2 = self.transit_model_v2.min_total_cost(size)
-
-            if self.use_transit_v2:
-                transit, transit_capacity, transit_cost = (
-                    transit_rule,
-                    transit_capacity_rule,
-                    transit_cost_v2,
-                )
-            else:
-                transit, transit_capacity, transit_cost = (
-                    transit_rule,
-                    transit_capacity_rule,
-                    transit_cost_rule,
-                )
-
-            demand = self.demand_model.evaluate(price, size)
-            logistics_cost = self.logistics_model.calculate_logistics(size)
-            markup = self.markup_model.evaluate(price)
-            stock = self.stock_model.generate_stock(price, size)
-
-            transit_counts[transit] += 1
-            if stock == self.stock_model.infinite_stock_value:
-                infinite_stock_count += 1
-
-            products.append(
-                ProductItemMessage(
-                    id=f"P{index:06d}",
-                    price=price,
-                    size=size,
-                    logistics=round(logistics_cost, 3),
-                    transit=transit,
-                    transit_size=transit_capacity,
-                    transit_cost=transit_cost,
-                    demand=round(demand, 3),
-                    markup=round(markup, 3),
-                    stock=stock,
-                )
+            processed += len(block)
+            transit_counts += np.bincount(block.transit, minlength=len(TRANSIT_MODES))
+            infinite_stock_count += int(
+                np.count_nonzero(block.stock == self.stock_model.infinite_stock_value)
             )
 
-            if index % progress_step == 0 or index == total_combinations:
-                pct = (index / total_combinations) * 100.0
+            if processed >= next_progress or processed == total_combinations:
+                percent = processed / total_combinations * 100
                 self._log(
-                    f"Working through combinations: {format_number(index)}/{format_number(total_combinations)} ({pct:.1f}%)"
+                    f"Working through combinations: {format_number(processed)}/{format_number(total_combinations)} ({percent:.1f}%)"
                 )
+                next_progress = (processed // progress_step + 1) * progress_step
+            yield block
 
+        transit_mix = dict(zip(TRANSIT_MODES, transit_counts.tolist()))
         self._log(
             "Transit mix: "
-            f"courier={format_number(transit_counts['COURIER'])}, "
-            f"pallet={format_number(transit_counts['PALLET'])}, "
-            f"container={format_number(transit_counts['CONTAINER'])}"
+            f"courier={format_number(transit_mix['COURIER'])}, "
+            f"pallet={format_number(transit_mix['PALLET'])}, "
+            f"container={format_number(transit_mix['CONTAINER'])}"
         )
         self._log(
             f"Transit output model: {'V2_MIN_TOTAL_COST' if self.use_transit_v2 else 'V1_RULE_WEIGHTED'}"
         )
         self._log(f"Infinite-stock products: {format_number(infinite_stock_count)}")
-        self._log(
-            f"Generation complete. Total products: {format_number(len(products))}"
-        )
-        return products
+        self._log(f"Generation complete. Total products: {format_number(processed)}")
+
+    def generate(self) -> ProductTable:
+        """Generate full Cartesian product of price-size combinations."""
+
+        return ProductTable.concat(list(self.generate_batches()))
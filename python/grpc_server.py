@@ -6,6 +6,7 @@ import grpc
 
 import algsolver_pb2
 import algsolver_pb2_grpc
+from catalog import ProductTable
 from common import log
 from generator import ProductGenerator
 from mapper import to_proto
@@ -38,21 +39,32 @@ class ProductEstimatorServicer(algsolver_pb2_grpc.ProductEstimatorServicer):
         value = os.getenv("USE_TRANSIT_V2", "0").strip().lower()
         return value in {"1", "true", "yes", "on"}
 
+    @staticmethod
+    def _solver_backend() -> str:
+        return os.getenv("SOLVER_BACKEND", "SCIP").strip().upper() or "SCIP"
+
+    @staticmethod
+    def _solver_verbose() -> bool:
+        value = os.getenv("SOLVER_VERBOSE", "0").strip().lower()
+        return value in {"1", "true", "yes", "on"}
+
     def GenerateCatalog(self, request, context):
         generator = ProductGenerator.from_proto_config(
             request.config, use_transit_v2=self._use_transit_v2()
         )
         products = generator.generate()
         response = GenerateCatalogResponseMessage(generated_count=len(products))
-        response.products.extend(products)
+        products.write_messages(response.products)
         return response
 
     def OptimizeCatalog(self, request, context):
-        products = list(request.products)
+        products = ProductTable.from_messages(request.products)
         optimizer = ProcurementOptimizer(
             SolverConfig(
                 budget_constraint=request.config.generation.budget,
                 space_constraint=request.config.generation.space,
+                backend=self._solver_backend(),
+                verbose=self._solver_verbose(),
             )
         )
         result = optimizer.optimize(products)
@@ -72,6 +84,8 @@ class ProductEstimatorServicer(algsolver_pb2_grpc.ProductEstimatorServicer):
             SolverConfig(
                 budget_constraint=request.config.generation.budget,
                 space_constraint=request.config.generation.space,
+                backend=self._solver_backend(),
+                verbose=self._solver_verbose(),
             )
         )
         result = optimizer.optimize(products)
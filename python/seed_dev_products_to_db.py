@@ -1,6 +1,6 @@
 import os
-from typing import Any, Iterable
 
+from catalog import ProductTable
 from dev_default import dev_default
 from generator import ProductGenerator
 
@@ -15,20 +15,19 @@ def _require_psycopg():
     return psycopg
 
 
-def _rows(products: Iterable[Any]):
-    for product in products:
-        yield (
-            product.id,
-            int(product.price),
-            int(product.size),
-            float(product.logistics),
-            str(product.transit),
-            float(product.transit_size),
-            float(product.transit_cost),
-            float(product.demand),
-            float(product.markup),
-            int(product.stock),
-        )
+def _rows(products: ProductTable):
+    return zip(
+        products.ids,
+        products.price.tolist(),
+        products.size.tolist(),
+        products.logistics.tolist(),
+        products.transit_names().tolist(),
+        products.transit_size.tolist(),
+        products.transit_cost.tolist(),
+        products.demand.tolist(),
+        products.markup.tolist(),
+        products.stock.tolist(),
+    )
 
 
 def main() -> None:
@@ -44,7 +43,6 @@ def main() -> None:
     generator = ProductGenerator.from_proto_config(
         dev_default, use_transit_v2=use_transit_v2
     )
-    products = generator.generate()
 
     conn = psycopg.connect(
         host="localhost",
@@ -72,15 +70,23 @@ def main() -> None:
                 """
             )
             cur.execute("TRUNCATE TABLE dev_products")
-            cur.executemany(
+            # COPY streams rows through psycopg's buffered writer instead of
+            # one INSERT round-trip per product.
+            with cur.copy(
                 """
-                INSERT INTO dev_products (
+                COPY dev_products (
                     id, price, size, logistics, transit,
                     transit_size, transit_cost, demand, markup, stock
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                list(_rows(products)),
-            )
+                ) FROM STDIN
+                """
+            ) as copy:
+                # Chunks are written as they are generated, so the full
+                # catalog is never held in memory at once.
+                generated = 0
+                for products in generator.generate_batches():
+                    generated += len(products)
+                    for row in _rows(products):
+                        copy.write_row(row)
             cur.execute("SELECT COUNT(*) FROM dev_products")
             count = cur.fetchone()[0]
             cur.execute(
@@ -94,7 +100,7 @@ def main() -> None:
             sample = cur.fetchall()
 
     print(f"mode={'V2_MIN_TOTAL_COST' if use_transit_v2 else 'V1_RULE_WEIGHTED'}")
-    print(f"generated={len(products)}")
+    print(f"generated={generated}")
     print(f"inserted={count}")
     print("sample_rows=")
     for row in sample:
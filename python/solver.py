@@ -1,22 +1,47 @@
 """
 procurement engine
 Multi-Period Inventory Purchase Optimization using Integer Programming
-Solver: Google OR-Tools SCIP
+Solver: Google OR-Tools SCIP (CP-SAT selectable via SolverConfig.backend)
 """
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from ortools.linear_solver import pywraplp
+import numpy as np
+from ortools.linear_solver import linear_solver_pb2, pywraplp
 
-import algsolver_pb2
-from common import format_price, format_volume, log
+from catalog import ProductTable
+from common import format_number, format_price, format_volume, log
 
+_STATUS_NAMES = {
+    pywraplp.Solver.OPTIMAL: "OPTIMAL",
+    pywraplp.Solver.FEASIBLE: "FEASIBLE",
+    pywraplp.Solver.INFEASIBLE: "INFEASIBLE",
+    pywraplp.Solver.UNBOUNDED: "UNBOUNDED",
+    pywraplp.Solver.ABNORMAL: "ABNORMAL",
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class SolverConfig:
     budget_constraint: Optional[float] = None
     space_constraint: Optional[float] = None
+    # Integer-capable pywraplp backend id (SCIP, CP_SAT, CBC, ...); LP-only
+    # backends are rejected. "CP_SAT" suits this all-integer model well.
+    backend: str = "SCIP"
+    # Seed the search with a greedy fill ordered by profit per unit of capacity.
+    warm_start: bool = False
+    # SCIP "name = value" lines, applied in one call: each
+    # SetSolverSpecificParametersAsString replaces the previous string.
+    scip_params: str = "presolving/maxrounds = -1"
+    # Stop once the incumbent is within this relative gap (e.g. 0.01 = 1%);
+    # None keeps the backend default.
+    relative_mip_gap: Optional[float] = None
+    # Worker threads for backends that support it (SCIP, CP_SAT); None keeps
+    # the backend default.
+    num_threads: Optional[int] = None
+    # Stream the backend's own search log and per-mode transit details.
+    verbose: bool = False
 
 
 class ProcurementOptimizer:
@@ -25,153 +50,325 @@ class ProcurementOptimizer:
     def __init__(self, config: Optional[SolverConfig] = None):
         """Initialize optimizer with optional budget/space constraints."""
         self.config = config or SolverConfig()
-        self.quantity_vars: Dict[str, Any] = {}
+        # quantity_vars[i] is the variable for product row candidate_rows[i].
+        self.candidate_rows: np.ndarray = np.empty(0, dtype=np.int64)
+        self.quantity_vars: List[Any] = []
 
     @staticmethod
     def _log(message: str):
         """Write structured solver logs."""
         log("solver", message)
 
-    def _calculate_transit_cost(
-        self, solver: pywraplp.Solver, products: List[algsolver_pb2.ProductItem]
-    ) -> Any:
-        """Calculate total transit costs grouped by transit mode."""
-        grouped: Dict[str, List[algsolver_pb2.ProductItem]] = {}
-        for product in products:
-            grouped.setdefault(product.transit, []).append(product)
-
-        cost_terms = []
-        for mode, mode_products in grouped.items():
-            if not mode_products:
+    def _transit_cost_per_size(self, products: ProductTable) -> np.ndarray:
+        """Per-row transit cost per unit of size, priced by each transit mode."""
+        cost_per_size = np.zeros(len(products))
+        for code, mode in enumerate(products.transit_labels):
+            rows = np.flatnonzero(products.transit == code)
+            if rows.size == 0:
                 continue
 
-            capacity = mode_products[0].transit_size
-            cost_per_unit = mode_products[0].transit_cost
-            cost_per_size = cost_per_unit / capacity
-            self._log(
-                f"Transit mode {mode}: capacity={capacity}, cost_per_unit={cost_per_unit}, "
-                f"cost_per_size={cost_per_size:.6f}, products={len(mode_products)}"
-            )
-            total_size_expr = solver.Sum(
-                [p.size * self.quantity_vars[p.id] for p in mode_products]
-            )
-            cost_terms.append(total_size_expr * cost_per_size)
+            first = rows[0]
+            capacity = float(products.transit_size[first])
+            cost_per_unit = float(products.transit_cost[first])
+            mode_cost_per_size = cost_per_unit / capacity
+            if self.config.verbose:
+                self._log(
+                    f"Transit mode {mode}: capacity={capacity}, cost_per_unit={cost_per_unit}, "
+                    f"cost_per_size={mode_cost_per_size:.6f}, products={rows.size}"
+                )
+            cost_per_size[rows] = mode_cost_per_size
+
+        return cost_per_size
 
-        return solver.Sum(cost_terms) if cost_terms else 0.0
+    @staticmethod
+    def _unit_revenue(products: ProductTable) -> np.ndarray:
+        """Expected revenue per unit for every product row."""
+        return (
+            products.demand
+            * (1.0 - products.logistics)
+            * products.markup
+            * products.price
+        )
 
-    def optimize(self, products: List[algsolver_pb2.ProductItem]) -> Dict:
+    def optimize(self, products: ProductTable) -> Dict:
         """Run optimization and return status, objective, and selected products."""
         self._log("Optimization pipeline started")
         self._log(f"Input products: {len(products)}")
 
-        solver = pywraplp.Solver.CreateSolver("SCIP")
+        # Computed once: it feeds the objective and is reported per product.
+        unit_revenue = self._unit_revenue(products)
+        coefficients = self._objective_coefficients(products, unit_revenue)
+        upper_bounds = self._quantity_bounds(products)
+        # Rows that lose money per unit or cannot fit a single unit are zero in
+        # every optimum, so they never become variables.
+        self.candidate_rows = np.flatnonzero((coefficients > 0) & (upper_bounds > 0))
+        self._log(
+            f"Candidate products: {format_number(self.candidate_rows.size)} "
+            f"({format_number(len(products) - self.candidate_rows.size)} dropped as "
+            "unprofitable or unfittable)"
+        )
+
+        rows = self._binding_rows(products, upper_bounds)
+        if not rows:
+            # With no limit that can bind, every candidate is bought up to its
+            # bound; the optimum is known without building a model.
+            self._log("No binding constraints: selecting all profitable stock")
+            quantities = np.zeros(len(products), dtype=np.int64)
+            quantities[self.candidate_rows] = upper_bounds[self.candidate_rows]
+            objective_value = float(np.dot(coefficients, quantities))
+            return self._build_result(
+                products, unit_revenue, "OPTIMAL", objective_value, quantities
+            )
+
+        backend = self.config.backend
+        solver = pywraplp.Solver.CreateSolver(backend)
         if not solver:
-            return {"status": "ERROR", "message": "Failed to create SCIP solver"}
+            return {"status": "ERROR", "message": f"Failed to create {backend} solver"}
+        if not solver.IsMip():
+            # LP-only backends (GLOP, PDLP) silently relax is_integer.
+            return {
+                "status": "ERROR",
+                "message": f"{backend} solver does not support integer variables",
+            }
+        self._log(f"Solver backend: {backend}")
 
-        solver.EnableOutput()
-        solver.SetSolverSpecificParametersAsString("parallel/maxnthreads = 0")
-        solver.SetSolverSpecificParametersAsString("presolving/maxrounds = -1")
+        if self.config.verbose:
+            solver.EnableOutput()
+        num_threads = self.config.num_threads
+        if num_threads is not None:
+            if solver.SetNumThreads(num_threads):
+                self._log(f"Solver threads: {num_threads}")
+            else:
+                self._log(f"Solver backend {backend} ignores num_threads")
+        if backend == "SCIP" and self.config.scip_params:
+            solver.SetSolverSpecificParametersAsString(self.config.scip_params)
 
-        self._create_decision_variables(solver, products)
-        self._define_objective(solver, products)
-        self._add_constraints(solver, products)
+        # The model is assembled as an MPModelProto and handed over in a single
+        # call; setting variables and coefficients one SWIG call at a time
+        # costs about twice as long on a full catalog.
+        candidates = self.candidate_rows
+        model = linear_solver_pb2.MPModelProto(maximize=True)
+        self._create_decision_variables(
+            model, coefficients[candidates], upper_bounds[candidates]
+        )
+        for row_coefficients, upper_bound, name in rows:
+            self._add_row(model, row_coefficients[candidates], upper_bound, name)
+        load_error = solver.LoadModelFromProto(model)
+        if load_error:
+            return {"status": "ERROR", "message": f"Failed to load model: {load_error}"}
+        self.quantity_vars = solver.variables()
 
-        status_code = solver.Solve()
-        return self._extract_solution(solver, products, status_code)
+        if self.config.warm_start:
+            self._add_greedy_hint(solver, products, coefficients, upper_bounds)
 
-    def _create_decision_variables(
-        self, solver: pywraplp.Solver, products: List[algsolver_pb2.ProductItem]
-    ):
-        """Create integer decision variables for each product quantity."""
-        self.quantity_vars = {}
-        for product in products:
-            max_qty = product.stock
-            self.quantity_vars[product.id] = solver.IntVar(
-                0, max_qty, f"qty_{product.id}"
+        params = pywraplp.MPSolverParameters()
+        if self.config.relative_mip_gap is not None:
+            params.SetDoubleParam(
+                pywraplp.MPSolverParameters.RELATIVE_MIP_GAP,
+                self.config.relative_mip_gap,
             )
+        status_code = solver.Solve(params)
+        return self._extract_solution(solver, products, unit_revenue, status_code)
 
-    def _define_objective(
-        self, solver: pywraplp.Solver, products: List[algsolver_pb2.ProductItem]
+    def _quantity_bounds(self, products: ProductTable) -> np.ndarray:
+        """Per-row quantity cap: stock, tightened by what each limit alone allows."""
+        upper_bounds = products.stock
+        for limit, usage, name in (
+            (self.config.budget_constraint, products.price, "budget"),
+            (self.config.space_constraint, products.size, "space"),
+        ):
+            if limit is None:
+                continue
+            # A single product can never take more units than the limit alone allows.
+            # The ratio stays float until it is clamped to the current bound, so an
+            # infinite or huge limit leaves the bound at stock instead of
+            # overflowing the int64 cast.
+            affordable = np.where(
+                usage > 0,
+                np.floor(max(0.0, limit) / np.maximum(usage, 1)),
+                upper_bounds,
+            )
+            tightened = affordable < upper_bounds
+            if tightened.any():
+                upper_bounds = np.minimum(affordable, upper_bounds).astype(np.int64)
+                self._log(
+                    f"Bounds tightened by {name}: {format_number(np.count_nonzero(tightened))} products"
+                )
+        return upper_bounds
+
+    def _create_decision_variables(
+        self,
+        model: linear_solver_pb2.MPModelProto,
+        coefficients: np.ndarray,
+        upper_bounds: np.ndarray,
     ):
-        """Define objective function: maximize revenue minus transit cost."""
-        revenue_terms = []
-        for product in products:
-            quantity = self.quantity_vars[product.id]
-            unit_revenue = (
-                product.demand
-                * (1.0 - product.logistics)
-                * product.markup
-                * product.price
+        """Create integer quantity variables carrying their objective coefficients."""
+        # Variables are named by position so building the model never formats
+        # the product id strings; they are only needed when results are reported.
+        add_variable = model.variable.add
+        for index, max_qty, coefficient in zip(
+            range(len(coefficients)), upper_bounds.tolist(), coefficients.tolist()
+        ):
+            add_variable(
+                lower_bound=0,
+                upper_bound=max_qty,
+                is_integer=True,
+                objective_coefficient=coefficient,
+                name=f"qty_{index}",
             )
-            revenue_terms.append(unit_revenue * quantity)
 
-        total_revenue = solver.Sum(revenue_terms)
-        transit_costs = self._calculate_transit_cost(solver, products)
-        solver.Maximize(total_revenue - transit_costs)
+    def _objective_coefficients(
+        self, products: ProductTable, unit_revenue: np.ndarray
+    ) -> np.ndarray:
+        """Net profit per unit: revenue minus the transit cost of its size."""
+        # Transit cost is linear in size * quantity, so it folds into each
+        # product's objective coefficient instead of a separate expression.
+        return unit_revenue - self._transit_cost_per_size(products) * products.size
 
-    def _add_constraints(
-        self, solver: pywraplp.Solver, products: List[algsolver_pb2.ProductItem]
+    def _add_row(
+        self,
+        model: linear_solver_pb2.MPModelProto,
+        coefficients: np.ndarray,
+        upper_bound: float,
+        name: str,
     ):
-        """Add budget and space constraints when configured."""
+        """Add `sum(coefficient * quantity) <= upper_bound` over every variable."""
+        constraint = model.constraint.add(
+            lower_bound=-np.inf, upper_bound=upper_bound, name=name
+        )
+        constraint.var_index.extend(range(len(coefficients)))
+        constraint.coefficient.extend(coefficients.astype(np.float64).tolist())
+
+    def _binding_rows(
+        self, products: ProductTable, upper_bounds: np.ndarray
+    ) -> List[Tuple[np.ndarray, float, str]]:
+        """Budget and space rows, as (coefficients, upper_bound, name), that can bind."""
+        rows = []
         if self.config.budget_constraint is not None:
-            self._log(
-                f"Adding budget constraint: <= {format_price(self.config.budget_constraint)}"
-            )
-            total_cost = solver.Sum(
-                [product.price * self.quantity_vars[product.id] for product in products]
-            )
-            solver.Add(total_cost <= self.config.budget_constraint)
+            budget = self.config.budget_constraint
+            rows.append((products.price, budget, "budget", format_price(budget)))
 
         if self.config.space_constraint is not None:
-            self._log(
-                f"Adding space constraint: <= {format_volume(self.config.space_constraint)}"
-            )
-            total_size = solver.Sum(
-                [product.size * self.quantity_vars[product.id] for product in products]
+            space = self.config.space_constraint
+            rows.append((products.size, space, "space", format_volume(space)))
+
+        candidates = self.candidate_rows
+        binding = []
+        for coefficients, upper_bound, name, limit_label in rows:
+            # Buying every candidate up to its bound is the row's largest possible
+            # activity; if even that fits, the row can never bind and only slows the LP.
+            max_activity = float(
+                np.dot(
+                    coefficients[candidates].astype(np.float64),
+                    upper_bounds[candidates],
+                )
             )
-            solver.Add(total_size <= self.config.space_constraint)
+            if max_activity <= upper_bound:
+                self._log(f"Skipping {name} constraint: never binding within stock")
+                continue
+            self._log(f"Adding {name} constraint: <= {limit_label}")
+            binding.append((coefficients, upper_bound, name))
+        return binding
+
+    def _add_greedy_hint(
+        self,
+        solver: pywraplp.Solver,
+        products: ProductTable,
+        coefficients: np.ndarray,
+        upper_bounds: np.ndarray,
+    ):
+        """Hint a feasible start: fill candidates best-ratio first."""
+        budget = self.config.budget_constraint
+        space = self.config.space_constraint
+        candidates = self.candidate_rows
+
+        capacity_share = np.zeros(candidates.size)
+        if budget is not None and budget > 0:
+            capacity_share += products.price[candidates] / budget
+        if space is not None and space > 0:
+            capacity_share += products.size[candidates] / space
+
+        ratio = coefficients[candidates] / np.maximum(capacity_share, 1e-12)
+        order = np.argsort(-ratio, kind="stable")
+        rows = candidates[order]
+
+        # SCIP drops partial solutions that leave most variables unknown, so
+        # every variable is hinted, at zero unless the greedy fill picks it.
+        hint_values = np.zeros(candidates.size, dtype=np.int64)
+        for index, price, size, max_qty in zip(
+            order.tolist(),
+            products.price[rows].tolist(),
+            products.size[rows].tolist(),
+            upper_bounds[rows].tolist(),
+        ):
+            quantity = max_qty
+            if budget is not None and price > 0:
+                quantity = min(quantity, int(budget // price))
+            if space is not None and size > 0:
+                quantity = min(quantity, int(space // size))
+            if quantity <= 0:
+                continue
+
+            if budget is not None:
+                budget -= price * quantity
+            if space is not None:
+                space -= size * quantity
+            hint_values[index] = quantity
+
+        solver.SetHint(self.quantity_vars, hint_values.tolist())
+        self._log(
+            f"Warm start hint: {format_number(np.count_nonzero(hint_values))} products"
+        )
 
     def _extract_solution(
         self,
         solver: pywraplp.Solver,
-        products: List[algsolver_pb2.ProductItem],
+        products: ProductTable,
+        unit_revenue: np.ndarray,
         status_code: int,
     ) -> Dict:
         """Extract solver output into serializable result dictionary."""
-        status_names = {
-            pywraplp.Solver.OPTIMAL: "OPTIMAL",
-            pywraplp.Solver.FEASIBLE: "FEASIBLE",
-            pywraplp.Solver.INFEASIBLE: "INFEASIBLE",
-            pywraplp.Solver.UNBOUNDED: "UNBOUNDED",
-            pywraplp.Solver.ABNORMAL: "ABNORMAL",
-        }
-        status = status_names.get(status_code, "UNKNOWN")
-        result = {"status": status, "objective_value": 0.0, "product_totals": {}}
-
-        if status in ["OPTIMAL", "FEASIBLE"]:
-            result["objective_value"] = solver.Objective().Value()
-            for product in products:
-                quantity = int(self.quantity_vars[product.id].solution_value())
-                if quantity <= 0:
-                    continue
-
-                unit_score = (
-                    product.demand
-                    * (1.0 - product.logistics)
-                    * product.markup
-                    * product.price
-                )
-                result["product_totals"][product.id] = {
-                    "quantity": quantity,
-                    "price": product.price,
-                    "size": product.size,
-                    "demand": product.demand,
-                    "logistics": product.logistics,
-                    "markup": product.markup,
-                    "stock": product.stock,
-                    "transit": product.transit,
-                    "unit_score": round(unit_score, 4),
-                    "total_score": round(unit_score * quantity, 4),
-                }
+        status = _STATUS_NAMES.get(status_code, "UNKNOWN")
+        if status not in ["OPTIMAL", "FEASIBLE"]:
+            return {"status": status, "objective_value": 0.0, "product_totals": {}}
+
+        # One export of the whole solution instead of a SWIG call per variable.
+        response = linear_solver_pb2.MPSolutionResponse()
+        solver.FillSolutionResponseProto(response)
+        quantities = np.zeros(len(products), dtype=np.int64)
+        quantities[self.candidate_rows] = np.array(response.variable_value).astype(
+            np.int64
+        )
+        return self._build_result(
+            products, unit_revenue, status, solver.Objective().Value(), quantities
+        )
+
+    def _build_result(
+        self,
+        products: ProductTable,
+        unit_revenue: np.ndarray,
+        status: str,
+        objective_value: float,
+        quantities: np.ndarray,
+    ) -> Dict:
+        """Serializable result dictionary for per-row purchase quantities."""
+        result = {"status": status, "objective_value": objective_value, "product_totals": {}}
+
+        transit_names = products.transit_names()
+        for row in np.flatnonzero(quantities > 0).tolist():
+            quantity = int(quantities[row])
+            unit_score = float(unit_revenue[row])
+            result["product_totals"][products.id_at(row)] = {
+                "quantity": quantity,
+                "price": int(products.price[row]),
+                "size": int(products.size[row]),
+                "demand": float(products.demand[row]),
+                "logistics": float(products.logistics[row]),
+                "markup": float(products.markup[row]),
+                "stock": int(products.stock[row]),
+                "transit": str(transit_names[row]),
+                "unit_score": round(unit_score, 4),
+                "total_score": round(unit_score * quantity, 4),
+            }
 
         return result